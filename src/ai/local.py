@@ -5,9 +5,45 @@ Local AI provider for HackAI Enhanced (Offline)
 
 import json
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
 from ai.base import BaseAIProvider
 from core.models import AIAnalysis
+from core.risk import RISK_KEYWORDS
+
+# Vulnerability patterns per tool, written in lowercase so they can be matched
+# against the already-lowered tool output without re.IGNORECASE
+_VULN_PATTERNS = {
+    "nmap": (
+        re.compile(r"vulnerable"),
+        re.compile(r"open port"),
+        re.compile(r"service detected")
+    ),
+    "nuclei": (
+        re.compile(r"\[(critical|high|medium|low)\]"),
+        re.compile(r"vulnerability found")
+    ),
+    "sqlmap": (
+        re.compile(r"sql injection"),
+        re.compile(r"parameter.*injectable")
+    ),
+    "nikto": (
+        re.compile(r"found"),
+        re.compile(r"vulnerability")
+    )
+}
+
+_MAX_FINDINGS = 5
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of text one slice at a time without copying the whole buffer"""
+    start = 0
+    while start < len(text):
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
 
 class LocalAIProvider(BaseAIProvider):
     """Local AI provider using rule-based analysis"""
@@ -57,8 +93,7 @@ class LocalAIProvider(BaseAIProvider):
     
     async def interpret_results(self, tool: str, output: str, target: str) -> AIAnalysis:
         """Interpret scan results using local rules"""
-        findings = self._extract_findings(tool, output)
-        risk_level = self._assess_output_risk(tool, output)
+        findings, risk_level = self._scan_output(tool, _iter_lines(output))
         recommendations = self._generate_recommendations(tool, findings, risk_level)
         
         return AIAnalysis(
@@ -134,53 +169,48 @@ class LocalAIProvider(BaseAIProvider):
         else:
             return "medium"
     
-    def _extract_findings(self, tool: str, output: str) -> List[str]:
-        """Extract security findings from tool output"""
-        findings = []
+    def _scan_output(self, tool: str, lines: Iterable[str]) -> Tuple[List[str], str]:
+        """Extract findings and assess risk in a single streaming pass over tool output
         
-        # Common vulnerability patterns
-        vuln_patterns = {
-            "nmap": [
-                r"VULNERABLE",
-                r"open port",
-                r"service detected"
-            ],
-            "nuclei": [
-                r"\[(critical|high|medium|low)\]",
-                r"vulnerability found"
-            ],
-            "sqlmap": [
-                r"sql injection",
-                r"parameter.*injectable"
-            ],
-            "nikto": [
-                r"found",
-                r"vulnerability"
-            ]
-        }
+        Lines are lowered one at a time, so the only extra memory is the current line
+        and its lowered copy rather than a lowered copy of the whole output.
+        The scan stops as soon as enough findings are collected and the risk is critical.
+        """
+        patterns = _VULN_PATTERNS.get(tool, ())
+        findings = []
+        risk_level = "low"
         
-        patterns = vuln_patterns.get(tool, [])
-        for pattern in patterns:
-            matches = re.findall(pattern, output, re.IGNORECASE)
-            findings.extend(matches)
+        for line in lines:
+            line_lower = line.lower()
+            # Lowering keeps offsets when the length is unchanged, so report the original case
+            source = line if len(line_lower) == len(line) else line_lower
+            
+            if len(findings) < _MAX_FINDINGS:
+                for pattern in patterns:
+                    for match in pattern.finditer(line_lower):
+                        # Report the severity group for patterns that capture one
+                        group = 1 if pattern.groups else 0
+                        findings.append(source[match.start(group):match.end(group)])
+                        if len(findings) >= _MAX_FINDINGS:
+                            break
+                    if len(findings) >= _MAX_FINDINGS:
+                        break
+            
+            if risk_level != "critical":
+                for level, keywords in RISK_KEYWORDS.items():
+                    if level == risk_level:
+                        break
+                    if any(word in line_lower for word in keywords):
+                        risk_level = level
+                        break
+            
+            if len(findings) >= _MAX_FINDINGS and risk_level == "critical":
+                break
         
         if not findings:
             findings = ["No obvious vulnerabilities detected"]
         
-        return findings[:5]  # Limit to 5 findings
-    
-    def _assess_output_risk(self, tool: str, output: str) -> str:
-        """Assess risk level based on tool output"""
-        output_lower = output.lower()
-        
-        if any(word in output_lower for word in ["critical", "vulnerable", "exploit"]):
-            return "critical"
-        elif any(word in output_lower for word in ["high", "dangerous", "severe"]):
-            return "high"
-        elif any(word in output_lower for word in ["medium", "warning", "caution"]):
-            return "medium"
-        else:
-            return "low"
+        return findings, risk_level
     
     def _generate_recommendations(self, tool: str, findings: List[str], risk_level: str) -> List[str]:
         """Generate recommendations based on findings and risk level"""
@@ -7,7 +7,7 @@ Uses local models for AI analysis without API dependencies
 import json
 import re
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import numpy as np
 
@@ -21,8 +21,68 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
     print("⚠️  Transformers not available. Install with: pip install transformers torch sentence-transformers")
 
+# Optional ONNX Runtime backend for the classifier
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    import onnxruntime as ort
+    OPTIMUM_AVAILABLE = True
+except ImportError:
+    OPTIMUM_AVAILABLE = False
+
 from src.ai.base import BaseAIProvider
 from src.core.models import AIAnalysis
+from src.core.risk import RISK_KEYWORDS
+
+CLASSIFIER_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+# Exported once, then reused on later startups
+CLASSIFIER_ONNX_DIR = Path("models/cache/onnx") / CLASSIFIER_MODEL.replace("/", "--")
+
+# Predefined payloads per attack type (plain strings, not regexes)
+_PAYLOAD_TUPLES: Dict[str, Tuple[str, ...]] = {
+    'sql_injection': (
+        "' OR 1=1--",
+        "'; DROP TABLE users--",
+        "' UNION SELECT NULL--",
+        "admin'--",
+        "1' AND '1'='1"
+    ),
+    'xss': (
+        "<script>alert('XSS')</script>",
+        "<img src=x onerror=alert('XSS')>",
+        "javascript:alert('XSS')",
+        "<svg onload=alert('XSS')>",
+        "';alert('XSS');//"
+    ),
+    'command_injection': (
+        "; ls -la",
+        "| whoami",
+        "&& cat /etc/passwd",
+        "`id`",
+        "$(whoami)"
+    )
+}
+
+_DEFAULT_PAYLOADS: Tuple[str, ...] = (
+    "test_payload_1",
+    "test_payload_2",
+    "test_payload_3"
+)
+
+# Lowercase security keywords matched against lowered text
+_SECURITY_KEYWORDS: Tuple[str, ...] = (
+    'vulnerability', 'exploit', 'attack', 'breach', 'malware', 'virus',
+    'firewall', 'encryption', 'authentication', 'authorization',
+    'sql injection', 'xss', 'csrf', 'rce', 'lfi', 'rfi',
+    'port', 'service', 'protocol', 'network', 'web', 'api',
+    'password', 'hash', 'crypto', 'stego', 'forensic',
+    'reverse', 'debug', 'binary', 'assembly', 'shellcode'
+)
+
+# Keyword hits needed before a critical rating skips the classifier
+_MIN_CRITICAL_HITS = 2
+
+# Texts up to this length with no risk keywords are rated low without the classifier
+_SHORT_TEXT_LENGTH = 64
 
 class LocalLLMProvider(BaseAIProvider):
     """Local LLM provider using transformers"""
@@ -49,9 +109,10 @@ class LocalLLMProvider(BaseAIProvider):
             # Load text generation model
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
             self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
+            self._compile_model()
             
             # Load sentiment/classification model
-            self.classifier = pipeline("sentiment-analysis", model="cardiffnlp/twitter-roberta-base-sentiment-latest")
+            self.classifier = self._load_classifier()
             
             # Load sentence embedding model
             self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
@@ -63,6 +124,47 @@ class LocalLLMProvider(BaseAIProvider):
             print(f"❌ Failed to load local LLM models: {e}")
             self.available = False
     
+    def _compile_model(self):
+        """Compile the generation model's forward pass to fuse kernels"""
+        eager_forward = self.model.forward
+        try:
+            self.model.forward = torch.compile(eager_forward, mode="reduce-overhead")
+            
+            # torch.compile is lazy, so run a warm-up generation to surface compile errors here
+            warmup = self.tokenizer.encode("warm up", return_tensors="pt")
+            with torch.no_grad():
+                self.model.generate(warmup, max_length=warmup.shape[-1] + 1, pad_token_id=self.tokenizer.eos_token_id)
+        except Exception as e:
+            self.model.forward = eager_forward
+            print(f"⚠️  torch.compile unavailable, using eager mode: {e}")
+    
+    def _load_classifier(self):
+        """Load the risk classifier, exported to ONNX Runtime when optimum is installed"""
+        if OPTIMUM_AVAILABLE:
+            try:
+                session_options = ort.SessionOptions()
+                session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                
+                exported = CLASSIFIER_ONNX_DIR.exists()
+                source = str(CLASSIFIER_ONNX_DIR) if exported else CLASSIFIER_MODEL
+                ort_model = ORTModelForSequenceClassification.from_pretrained(
+                    source,
+                    export=not exported,
+                    provider="CPUExecutionProvider",
+                    session_options=session_options
+                )
+                tokenizer = AutoTokenizer.from_pretrained(source)
+                
+                if not exported:
+                    ort_model.save_pretrained(CLASSIFIER_ONNX_DIR)
+                    tokenizer.save_pretrained(CLASSIFIER_ONNX_DIR)
+                
+                return pipeline("sentiment-analysis", model=ort_model, tokenizer=tokenizer)
+            except Exception as e:
+                print(f"⚠️  ONNX Runtime classifier failed, using PyTorch: {e}")
+        
+        return pipeline("sentiment-analysis", model=CLASSIFIER_MODEL)
+    
     def _analyze_text_with_llm(self, text: str, max_length: int = 100) -> str:
         """Generate analysis using local LLM"""
         if not self.available or not self.tokenizer or not self.model:
@@ -96,6 +198,17 @@ class LocalLLMProvider(BaseAIProvider):
         if not self.available or not self.classifier:
             return {"risk_level": "medium", "confidence": 0.5}
         
+        # Skip the classifier when keywords already settle the risk level
+        keyword_level, hits = self._count_risk_keywords(text)
+        obviously_low = keyword_level == "low" and len(text) <= _SHORT_TEXT_LENGTH
+        obviously_critical = keyword_level == "critical" and hits >= _MIN_CRITICAL_HITS
+        if obviously_low or obviously_critical:
+            return {
+                "risk_level": keyword_level,
+                "confidence": 0.9,
+                "sentiment": None
+            }
+        
         try:
             # Analyze sentiment
             result = self.classifier(text[:500])
@@ -122,21 +235,23 @@ class LocalLLMProvider(BaseAIProvider):
             print(f"❌ Risk classification failed: {e}")
             return {"risk_level": "medium", "confidence": 0.5}
     
+    def _count_risk_keywords(self, text: str) -> Tuple[str, int]:
+        """Find the most severe risk level with keyword hits, returning the level and hit count"""
+        text_lower = text.lower()
+        
+        for level, keywords in RISK_KEYWORDS.items():
+            hits = sum(text_lower.count(word) for word in keywords)
+            if hits:
+                return level, hits
+        
+        return "low", 0
+    
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract security-related keywords"""
-        security_keywords = [
-            'vulnerability', 'exploit', 'attack', 'breach', 'malware', 'virus',
-            'firewall', 'encryption', 'authentication', 'authorization',
-            'sql injection', 'xss', 'csrf', 'rce', 'lfi', 'rfi',
-            'port', 'service', 'protocol', 'network', 'web', 'api',
-            'password', 'hash', 'crypto', 'stego', 'forensic',
-            'reverse', 'debug', 'binary', 'assembly', 'shellcode'
-        ]
-        
         found_keywords = []
         text_lower = text.lower()
         
-        for keyword in security_keywords:
+        for keyword in _SECURITY_KEYWORDS:
             if keyword in text_lower:
                 found_keywords.append(keyword)
         
@@ -267,57 +382,13 @@ class LocalLLMProvider(BaseAIProvider):
             return self._get_fallback_analysis_result(tool, output, target)
     
     async def generate_payloads(self, attack_type: str, target_info: Dict[str, Any]) -> List[str]:
-        """Generate attack payloads using local LLM"""
-        if not self.available:
-            return self._get_fallback_payloads(attack_type)
-        
-        try:
-            # Generate payloads using LLM
-            payload_prompt = f"Generate {attack_type} payloads for security testing"
-            payload_text = self._analyze_text_with_llm(payload_prompt, max_length=200)
-            
-            # Extract payloads from text
-            payloads = self._extract_payloads_from_text(payload_text, attack_type)
-            
-            return payloads
-            
-        except Exception as e:
-            print(f"❌ Local LLM payload generation failed: {e}")
-            return self._get_fallback_payloads(attack_type)
+        """Generate attack payloads from the predefined payload table"""
+        # The table needs no model, so it is served whether or not one loaded
+        return self._get_predefined_payloads(attack_type)
     
-    def _extract_payloads_from_text(self, text: str, attack_type: str) -> List[str]:
-        """Extract payloads from generated text"""
-        # Common payload patterns
-        payload_patterns = {
-            'sql_injection': [
-                r"' OR 1=1--",
-                r"'; DROP TABLE users--",
-                r"' UNION SELECT NULL--",
-                r"admin'--",
-                r"1' AND '1'='1"
-            ],
-            'xss': [
-                r"<script>alert\('XSS'\)</script>",
-                r"<img src=x onerror=alert\('XSS'\)>",
-                r"javascript:alert\('XSS'\)",
-                r"<svg onload=alert\('XSS'\)>",
-                r"';alert\('XSS'\);//"
-            ],
-            'command_injection': [
-                r"; ls -la",
-                r"\| whoami",
-                r"&& cat /etc/passwd",
-                r"`id`",
-                r"\$\(whoami\)"
-            ]
-        }
-        
-        # Return predefined payloads for the attack type
-        return payload_patterns.get(attack_type, [
-            "test_payload_1",
-            "test_payload_2",
-            "test_payload_3"
-        ])
+    def _get_predefined_payloads(self, attack_type: str) -> List[str]:
+        """Get the predefined payloads for an attack type"""
+        return list(_PAYLOAD_TUPLES.get(attack_type, _DEFAULT_PAYLOADS))
     
     def _get_fallback_analysis(self, target: str) -> Dict[str, Any]:
         """Fallback analysis when LLM is not available"""
@@ -340,14 +411,6 @@ class LocalLLMProvider(BaseAIProvider):
             model_used="fallback"
         )
     
-    def _get_fallback_payloads(self, attack_type: str) -> List[str]:
-        """Fallback payloads"""
-        return [
-            f"test_{attack_type}_payload_1",
-            f"test_{attack_type}_payload_2",
-            f"test_{attack_type}_payload_3"
-        ]
-    
     def get_models(self) -> List[str]:
         """Get available local models"""
         if self.available:
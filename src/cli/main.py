@@ -5,22 +5,37 @@ Main CLI interface for HackAI Enhanced
 
 import asyncio
 import argparse
+import hashlib
 import sys
 import os
 import time
+from collections import Counter
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.colors import Colors
+from core.colors import Colors, SUCCESS_LABEL, FAILED_LABEL, RISK_LABELS
 from core.models import ScanResult, AIAnalysis
 from database.manager import EnhancedDatabaseManager
 from tools.manager import ToolManager
 from ai.base import AIIntegrationManager
-from ai.gemini import GeminiProvider
-from ai.local import LocalAIProvider
+
+# Rich renders the tool execution phase as a live table when installed
+try:
+    from rich.live import Live
+    from rich.markup import escape
+    from rich.table import Table
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+# Sort rank of each risk level, from the least to the most severe
+RISK_ORDER = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+
+# Shorter (or failed) tool output is not sent to the AI provider
+MIN_ANALYZABLE_OUTPUT = 16
 
 class HackAIEnhancedCLI:
     """Main CLI interface for HackAI Enhanced"""
@@ -31,11 +46,21 @@ class HackAIEnhancedCLI:
         self.ai_manager = AIIntegrationManager()
         self.session_id = f"session_{int(time.time())}"
         
-        # Initialize AI providers
-        self._setup_ai_providers()
+        # AI providers are set up on first use so commands like --list-tools
+        # don't pay for importing the model SDKs
+        self._ai_ready = False
+    
+    def _ensure_ai_providers(self):
+        """Setup AI providers the first time they are needed"""
+        if not self._ai_ready:
+            self._setup_ai_providers()
+            self._ai_ready = True
     
     def _setup_ai_providers(self):
         """Setup available AI providers"""
+        from ai.gemini import GeminiProvider
+        from ai.local import LocalAIProvider
+        
         # Add Gemini provider if API key is available
         gemini_key = os.getenv('GEMINI_API_KEY')
         if gemini_key:
@@ -58,6 +83,8 @@ class HackAIEnhancedCLI:
         print(f"Target: {Colors.colorize(target, Colors.CYAN)}")
         print(f"Scan Type: {Colors.colorize(scan_type, Colors.CYAN)}")
         
+        self._ensure_ai_providers()
+        
         try:
             # AI target analysis
             print(f"\n{Colors.colorize('🔍 AI Target Analysis Phase...', Colors.BLUE)}")
@@ -72,67 +99,30 @@ class HackAIEnhancedCLI:
             if analysis.get("precautions"):
                 print(f"   ⚠️  Precautions: {Colors.colorize(analysis['precautions'], Colors.YELLOW)}")
             
-            # Execute recommended tools
+            # Execute recommended tools concurrently
             print(f"\n{Colors.colorize('🚀 Tool Execution Phase...', Colors.PURPLE)}")
             results = []
             ai_analyses = []
             
-            for i, tool_name in enumerate(analysis['recommended_tools'], 1):
-                if tool_name not in self.tool_manager.tools:
-                    print(f"   {Colors.colorize(f'⚠️  Tool {tool_name} not available, skipping...', Colors.YELLOW)}")
-                    continue
-                
-                print(f"\n   {Colors.colorize(f'🔧 [{i}/{len(analysis['recommended_tools'])}] Executing {tool_name.upper()}...', Colors.BLUE)}")
-                
-                try:
-                    # Execute tool
-                    result = await self.tool_manager.execute_tool(tool_name, [], target, self.session_id)
+            tools = analysis['recommended_tools']
+            table = self._create_results_table() if RICH_AVAILABLE else None
+            runs = [self._run_tool(tool_name, i, len(tools), target, table) for i, tool_name in enumerate(tools, 1)]
+            
+            if table is not None:
+                with Live(table, refresh_per_second=4):
+                    outcomes = await asyncio.gather(*runs)
+            else:
+                outcomes = await asyncio.gather(*runs)
+            
+            # Save to database in one transaction once every tool has finished
+            analyzed = []
+            for result, ai_analysis in outcomes:
+                if result:
                     results.append(result)
-                    
-                    # Display execution summary
-                    status_color = Colors.GREEN if result.success else Colors.RED
-                    status_text = "SUCCESS" if result.success else "FAILED"
-                    
-                    print(f"      Status: {Colors.colorize(status_text, status_color)}")
-                    print(f"      Duration: {Colors.colorize(f'{result.duration:.2f}s', Colors.CYAN)}")
-                    print(f"      Vulnerabilities: {Colors.colorize(str(result.vulnerabilities_found), Colors.RED if result.vulnerabilities_found > 0 else Colors.GREEN)}")
-                    
-                    # Show sample output
-                    if result.success and result.output.strip():
-                        sample_lines = result.output.strip().split('\n')[:2]
-                        for line in sample_lines:
-                            if line.strip():
-                                truncated = line[:80] + "..." if len(line) > 80 else line
-                                print(f"      📄 {Colors.colorize(truncated, Colors.WHITE)}")
-                    
-                    # AI interpretation
-                    print(f"      {Colors.colorize('🧠 AI Analysis...', Colors.PURPLE)}")
-                    
-                    ai_analysis = await self.ai_manager.interpret_results(
-                        tool_name, result.output, target
-                    )
+                if result and ai_analysis:
                     ai_analyses.append(ai_analysis)
-                    
-                    # Display AI insights
-                    risk_color = Colors.RED if ai_analysis.risk_level in ['high', 'critical'] else Colors.YELLOW
-                    print(f"         Summary: {Colors.colorize(ai_analysis.summary, Colors.WHITE)}")
-                    print(f"         Risk: {Colors.colorize(ai_analysis.risk_level.upper(), risk_color)}")
-                    print(f"         Confidence: {Colors.colorize(f'{ai_analysis.confidence:.1%}', Colors.CYAN)}")
-                    
-                    if ai_analysis.findings:
-                        print(f"         Key Findings:")
-                        for finding in ai_analysis.findings[:2]:  # Show top 2
-                            print(f"           • {Colors.colorize(finding, Colors.YELLOW)}")
-                    
-                    # Save to database
-                    self.db_manager.save_scan_result(
-                        result, 
-                        ai_analyses[-1] if ai_analyses else None
-                    )
-                    
-                except Exception as e:
-                    error_msg = f"Error executing {tool_name}: {str(e)}"
-                    print(f"      {Colors.colorize('❌ ' + error_msg, Colors.RED)}")
+                    analyzed.append((result, ai_analysis))
+            self.db_manager.save_scan_results_bulk(analyzed)
             
             # Display scan completion summary
             self._display_scan_summary(results, ai_analyses)
@@ -143,28 +133,151 @@ class HackAIEnhancedCLI:
             print(f"{Colors.colorize(f'❌ AI-guided scan failed: {str(e)}', Colors.RED)}")
             return []
     
+    async def _run_tool(self, tool_name: str, index: int, total: int, target: str, table=None) -> Tuple[Optional[ScanResult], Optional[AIAnalysis]]:
+        """Execute one tool and interpret its output, reporting to the live table or as a single text block"""
+        lines = []
+        result = None
+        ai_analysis = None
+        error_msg = ""
+        
+        if tool_name not in self.tool_manager.tools:
+            if table is not None:
+                self._add_result_row(table, tool_name, result, ai_analysis, "not available, skipped")
+            else:
+                lines.append(f"   {Colors.colorize(f'⚠️  Tool {tool_name} not available, skipping...', Colors.YELLOW)}")
+                self._write_report(lines)
+            return result, ai_analysis
+        
+        lines.append(f"\n   {Colors.colorize(f'🔧 [{index}/{total}] Executing {tool_name.upper()}...', Colors.BLUE)}")
+        
+        # Errors are reported in the tool's own block; gather never sees an exception
+        try:
+            # Execute tool
+            result = await self.tool_manager.execute_tool(tool_name, [], target, self.session_id)
+            
+            # Display execution summary
+            lines.append(f"      Status: {SUCCESS_LABEL if result.success else FAILED_LABEL}")
+            lines.append(f"      Duration: {Colors.colorize(f'{result.duration:.2f}s', Colors.CYAN)}")
+            lines.append(f"      Vulnerabilities: {Colors.colorize(str(result.vulnerabilities_found), Colors.RED if result.vulnerabilities_found > 0 else Colors.GREEN)}")
+            
+            # Show sample output
+            if result.success and result.output.strip():
+                sample_lines = result.output.strip().split('\n')[:2]
+                for line in sample_lines:
+                    if line.strip():
+                        truncated = line[:80] + "..." if len(line) > 80 else line
+                        lines.append(f"      📄 {Colors.colorize(truncated, Colors.WHITE)}")
+            
+            # AI interpretation
+            if not result.success or len(result.output.strip()) < MIN_ANALYZABLE_OUTPUT:
+                # Nothing worth sending to the AI provider
+                ai_analysis = AIAnalysis(
+                    summary="No output to analyze",
+                    findings=[],
+                    recommendations=[],
+                    risk_level="low",
+                    confidence=0.0,
+                    model_used="none"
+                )
+            else:
+                lines.append(f"      {Colors.colorize('🧠 AI Analysis...', Colors.PURPLE)}")
+                ai_analysis = await self._interpret_results_cached(tool_name, result.output, target)
+            
+            # Display AI insights
+            risk_label = RISK_LABELS.get(ai_analysis.risk_level) or Colors.colorize(ai_analysis.risk_level.upper(), Colors.YELLOW)
+            lines.append(f"         Summary: {Colors.colorize(ai_analysis.summary, Colors.WHITE)}")
+            lines.append(f"         Risk: {risk_label}")
+            lines.append(f"         Confidence: {Colors.colorize(f'{ai_analysis.confidence:.1%}', Colors.CYAN)}")
+            
+            if ai_analysis.findings:
+                lines.append(f"         Key Findings:")
+                for finding in ai_analysis.findings[:2]:  # Show top 2
+                    lines.append(f"           • {Colors.colorize(finding, Colors.YELLOW)}")
+            
+        except Exception as e:
+            error_msg = f"Error executing {tool_name}: {str(e)}"
+            lines.append(f"      {Colors.colorize('❌ ' + error_msg, Colors.RED)}")
+        
+        if table is not None:
+            self._add_result_row(table, tool_name, result, ai_analysis, error_msg)
+        else:
+            self._write_report(lines)
+        
+        return result, ai_analysis
+    
+    def _create_results_table(self):
+        """Create the live table that shows one row per finished tool"""
+        table = Table(title="Tool Execution")
+        for column in ("Tool", "Status", "Duration", "Vulns", "Risk", "Top Finding"):
+            table.add_column(column)
+        return table
+    
+    def _add_result_row(self, table, tool_name: str, result: Optional[ScanResult], ai_analysis: Optional[AIAnalysis], note: str = ""):
+        """Add one tool's outcome to the live results table"""
+        if result is None:
+            table.add_row(tool_name, "[yellow]-[/yellow]", "-", "-", "-", escape(note))
+            return
+        
+        status = "[green]SUCCESS[/green]" if result.success else "[red]FAILED[/red]"
+        vulns = f"[red]{result.vulnerabilities_found}[/red]" if result.vulnerabilities_found > 0 else "0"
+        risk = "-"
+        detail = note
+        if ai_analysis:
+            risk_style = "red" if ai_analysis.risk_level in ['high', 'critical'] else "yellow"
+            risk = f"[{risk_style}]{ai_analysis.risk_level.upper()}[/{risk_style}]"
+            detail = detail or (ai_analysis.findings[0] if ai_analysis.findings else "")
+        
+        table.add_row(tool_name, status, f"{result.duration:.2f}s", vulns, risk, escape(detail))
+    
+    def _write_report(self, lines: List[str]):
+        """Write a tool report with one write and flush so concurrent tools do not interleave"""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
+    async def _interpret_results_cached(self, tool_name: str, output: str, target: str) -> AIAnalysis:
+        """Interpret tool output, reusing a stored analysis when the same output was seen before"""
+        self._ensure_ai_providers()
+        provider = self.ai_manager.default_provider
+        key = hashlib.blake2b(f"{provider}|{tool_name}|{target}|{output}".encode(), digest_size=16).hexdigest()
+        
+        cached = self.db_manager.get_ai_cache(key)
+        if cached:
+            return cached
+        
+        ai_analysis = await self.ai_manager.interpret_results(tool_name, output, target)
+        self.db_manager.put_ai_cache(key, ai_analysis)
+        return ai_analysis
+    
     def _display_scan_summary(self, results: List[ScanResult], ai_analyses: List[AIAnalysis]):
         """Display scan completion summary"""
         print(f"\n{Colors.colorize('📊 SCAN COMPLETION SUMMARY', Colors.BOLD + Colors.CYAN)}")
+        # Aggregate every counter in a single pass over the results
+        successful = failed = vulnerabilities = 0
+        total_duration = 0.0
+        for r in results:
+            if r.success:
+                successful += 1
+            else:
+                failed += 1
+            vulnerabilities += r.vulnerabilities_found
+            total_duration += r.duration
+        
         print(f"  Total Tools Executed: {len(results)}")
-        print(f"  Successful Executions: {sum(1 for r in results if r.success)}")
-        print(f"  Failed Executions: {sum(1 for r in results if not r.success)}")
-        print(f"  Total Vulnerabilities Found: {sum(r.vulnerabilities_found for r in results)}")
+        print(f"  Successful Executions: {successful}")
+        print(f"  Failed Executions: {failed}")
+        print(f"  Total Vulnerabilities Found: {vulnerabilities}")
         print(f"  AI Analyses Generated: {len(ai_analyses)}")
         
         if results:
-            avg_duration = sum(r.duration for r in results) / len(results)
+            avg_duration = total_duration / len(results)
             print(f"  Average Tool Duration: {avg_duration:.2f}s")
         
         # Risk distribution
-        risk_counts = {}
-        for analysis in ai_analyses:
-            risk = analysis.risk_level
-            risk_counts[risk] = risk_counts.get(risk, 0) + 1
+        risk_counts = Counter(analysis.risk_level for analysis in ai_analyses)
         
         if risk_counts:
             print(f"\n{Colors.colorize('⚠️  Risk Distribution:', Colors.YELLOW)}")
-            for risk, count in sorted(risk_counts.items(), key=lambda x: ['low', 'medium', 'high', 'critical'].index(x[0])):
+            for risk, count in sorted(risk_counts.items(), key=lambda x: RISK_ORDER.get(x[0], 99)):
                 risk_color = Colors.RED if risk in ['high', 'critical'] else Colors.YELLOW
                 print(f"    {risk.upper()}: {Colors.colorize(str(count), risk_color)}")
     
@@ -184,6 +297,7 @@ class HackAIEnhancedCLI:
         print(f"  Tools Available: {Colors.colorize(f'{available_tools}/{total_tools}', Colors.GREEN if available_tools == total_tools else Colors.YELLOW)}")
         
         # Check AI providers
+        self._ensure_ai_providers()
         print(f"\n{Colors.colorize('🤖 AI Integration Status:', Colors.BLUE)}")
         for name, provider in self.ai_manager.providers.items():
             status = Colors.colorize("✅ Available", Colors.GREEN) if provider.is_available() else Colors.colorize("❌ Unavailable", Colors.RED)
@@ -220,8 +334,8 @@ class HackAIEnhancedCLI:
         print(f"\n{Colors.colorize('📦 Tool Installation Manager', Colors.CYAN)}")
         
         if install_all:
-            missing_tools = [name for name, tool in self.tool_manager.tools.items() 
-                           if not self.tool_manager.check_tool_availability().get(name, False)]
+            availability = self.tool_manager.check_tool_availability(refresh=True)
+            missing_tools = [name for name in self.tool_manager.tools if not availability.get(name, False)]
         elif tools:
             missing_tools = tools
         else:
@@ -237,13 +351,16 @@ class HackAIEnhancedCLI:
         successful_installations = []
         failed_installations = []
         
-        for i, tool in enumerate(missing_tools, 1):
-            print(f"\n[{i}/{len(missing_tools)}] {Colors.colorize(f'Installing {tool}...', Colors.CYAN)}")
-            
-            if self.tool_manager.install_tool(tool):
+        # Tools sharing a package manager are installed in one batch
+        results = self.tool_manager.install_many(missing_tools)
+        for i, (tool, installed) in enumerate(results.items(), 1):
+            if installed:
                 successful_installations.append(tool)
+                status = Colors.colorize('installed', Colors.GREEN)
             else:
                 failed_installations.append(tool)
+                status = Colors.colorize('failed', Colors.RED)
+            print(f"\n[{i}/{len(results)}] {Colors.colorize(tool, Colors.CYAN)} {status}")
         
         # Installation summary
         print(f"\n{Colors.colorize('📊 Installation Summary:', Colors.CYAN)}")
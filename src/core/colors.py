@@ -3,6 +3,8 @@
 Color codes for CLI output
 """
 
+from functools import lru_cache
+
 class Colors:
     """Enhanced Color codes for CLI output"""
     RED = '\033[91m'
@@ -23,6 +25,7 @@ class Colors:
     BG_BLUE = '\033[104m'
     
     @staticmethod
+    @lru_cache(maxsize=1024)
     def colorize(text: str, color: str) -> str:
         """Apply color to text"""
         return f"{color}{text}{Colors.END}"
@@ -38,3 +41,18 @@ class Colors:
             else:
                 result += char
         return result
+
+# Pre-built labels for strings printed on every tool run
+SUCCESS_LABEL = Colors.colorize("SUCCESS", Colors.GREEN)
+FAILED_LABEL = Colors.colorize("FAILED", Colors.RED)
+RISK_LOW = Colors.colorize("LOW", Colors.YELLOW)
+RISK_MED = Colors.colorize("MEDIUM", Colors.YELLOW)
+RISK_HIGH = Colors.colorize("HIGH", Colors.RED)
+RISK_CRIT = Colors.colorize("CRITICAL", Colors.RED)
+
+RISK_LABELS = {
+    "low": RISK_LOW,
+    "medium": RISK_MED,
+    "high": RISK_HIGH,
+    "critical": RISK_CRIT
+}
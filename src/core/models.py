@@ -3,25 +3,43 @@
 Data models for HackAI Enhanced
 """
 
+import shlex
+import sys
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
-@dataclass
+# slots=True drops the per-instance __dict__ but needs Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
 class ToolConfig:
-    """Configuration for a security tool"""
+    """Configuration for a security tool (immutable, shared by every ToolManager)"""
     name: str
     command: str
     category: str
     description: str
-    install_cmd: Optional[str] = None
-    check_cmd: Optional[str] = None
-    version_cmd: Optional[str] = None
+    install_cmd: Optional[Tuple[str, ...]] = None
+    check_cmd: Optional[Tuple[str, ...]] = None
+    version_cmd: Optional[Tuple[str, ...]] = None
     ai_enhanced: bool = False
-    common_args: List[str] = None
+    common_args: Tuple[str, ...] = ()
     requires_target: bool = True
+    
+    def __post_init__(self):
+        # Commands may be given as shell-style strings; tokenize them once here
+        # so quoted arguments like python3 -c 'import pwn' survive. Everything is
+        # stored as tuples so the shared registry entries really are immutable
+        # (and hashable); the class is frozen, so this goes through object.__setattr__
+        for attr in ("install_cmd", "check_cmd", "version_cmd"):
+            value = getattr(self, attr)
+            if isinstance(value, str):
+                value = shlex.split(value)
+            if value is not None:
+                object.__setattr__(self, attr, tuple(value))
+        object.__setattr__(self, "common_args", tuple(self.common_args or ()))
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScanResult:
     """Result from a security scan"""
     tool: str
@@ -35,8 +53,9 @@ class ScanResult:
     session_id: str = ""
     risk_level: str = "medium"
     vulnerabilities_found: int = 0
+    output_path: str = ""  # Full output on disk when output was truncated
 
-@dataclass
+@dataclass(**_SLOTS)
 class AIAnalysis:
     """AI analysis of scan results"""
     summary: str
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Risk keyword tables for HackAI Enhanced
+"""
+
+# Risk keywords, checked from the most to the least severe level
+RISK_KEYWORDS = {
+    "critical": ("critical", "vulnerable", "exploit"),
+    "high": ("high", "dangerous", "severe"),
+    "medium": ("medium", "warning", "caution")
+}
@@ -3,22 +3,78 @@
 Database management for HackAI Enhanced
 """
 
+import atexit
+import os
 import sqlite3
 import json
+import threading
+import time
+from dataclasses import asdict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Tuple
 from core.models import ScanResult, AIAnalysis
 
+# orjson is an optional, faster JSON encoder
+try:
+    import orjson
+    
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj)
+
 class EnhancedDatabaseManager:
     """Enhanced database manager for scan results and AI analysis"""
     
     def __init__(self, db_path: str = "hackai_enhanced.db"):
         self.db_path = db_path
+        
+        # One connection is shared by every call; the lock serializes access across threads
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        atexit.register(self.close)
+        
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection with WAL mode and the tuning PRAGMAs"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        # WAL mode is persistent on the database file and creates -wal/-shm sidecar files
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
+    
+    def close(self):
+        """Close the shared database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    @contextmanager
+    def _reading(self):
+        """Use the shared connection for reads"""
+        with self._lock:
+            yield self._conn
+    
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements in one write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
     def init_database(self):
         """Initialize comprehensive database schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             # Main scan results table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS scan_results (
@@ -30,14 +86,20 @@ class EnhancedDatabaseManager:
                     output TEXT,
                     exit_code INTEGER,
                     duration REAL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    timestamp INTEGER NOT NULL,
                     success INTEGER,
                     risk_level TEXT DEFAULT 'medium',
                     vulnerabilities_found INTEGER DEFAULT 0,
-                    ai_analyzed INTEGER DEFAULT 0
+                    ai_analyzed INTEGER DEFAULT 0,
+                    output_path TEXT
                 )
             """)
             
+            # Add columns introduced after the first schema version
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(scan_results)")}
+            if "output_path" not in columns:
+                conn.execute("ALTER TABLE scan_results ADD COLUMN output_path TEXT")
+            
             # AI analysis results
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS ai_analysis (
@@ -97,107 +159,142 @@ class EnhancedDatabaseManager:
                 )
             """)
             
+            # Cache of AI analyses keyed by a hash of tool, target and output
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    created DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
             # Create indexes
             conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_results_target ON scan_results(target)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_results_timestamp ON scan_results(timestamp)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_results_tool ON scan_results(tool)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_results_tool_ts ON scan_results(tool, timestamp DESC)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_results_session ON scan_results(session_id)")
+            
+            # The (tool, timestamp) index covers lookups by tool alone
+            conn.execute("DROP INDEX IF EXISTS idx_scan_results_tool")
     
     def save_scan_result(self, result: ScanResult, ai_analysis: Optional[AIAnalysis] = None):
         """Save scan result with optional AI analysis"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                INSERT INTO scan_results 
-                (session_id, tool, target, command, output, exit_code, duration, timestamp, success, risk_level, vulnerabilities_found, ai_analyzed)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                result.session_id, result.tool, result.target, result.command,
-                result.output, result.exit_code, result.duration, result.timestamp,
-                result.success, result.risk_level, result.vulnerabilities_found,
-                1 if ai_analysis else 0
-            ))
-            
-            scan_result_id = cursor.lastrowid
-            
-            if ai_analysis:
-                conn.execute("""
-                    INSERT INTO ai_analysis 
-                    (scan_result_id, model_used, summary, findings, recommendations, risk_assessment, confidence_score)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
+        self.save_scan_results_bulk([(result, ai_analysis)])
+    
+    def save_scan_results_bulk(self, items: List[Tuple[ScanResult, Optional[AIAnalysis]]]):
+        """Save many scan results with their optional AI analyses in a single transaction"""
+        if not items:
+            return
+        
+        with self._transaction() as conn:
+            ai_rows = []
+            for result, ai_analysis in items:
+                cursor = conn.execute("""
+                    INSERT INTO scan_results 
+                    (session_id, tool, target, command, output, exit_code, duration, timestamp, success, risk_level, vulnerabilities_found, ai_analyzed, output_path)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
-                    scan_result_id, ai_analysis.model_used, ai_analysis.summary,
-                    json.dumps(ai_analysis.findings), json.dumps(ai_analysis.recommendations),
-                    ai_analysis.risk_level, ai_analysis.confidence
+                    result.session_id, result.tool, result.target, result.command,
+                    result.output, result.exit_code, result.duration, int(result.timestamp),
+                    result.success, result.risk_level, result.vulnerabilities_found,
+                    1 if ai_analysis else 0, result.output_path or None
                 ))
+                
+                if ai_analysis:
+                    ai_rows.append((
+                        cursor.lastrowid, ai_analysis.model_used, ai_analysis.summary,
+                        _json_dumps(ai_analysis.findings), _json_dumps(ai_analysis.recommendations),
+                        ai_analysis.risk_level, ai_analysis.confidence
+                    ))
+            
+            conn.executemany("""
+                INSERT INTO ai_analysis 
+                (scan_result_id, model_used, summary, findings, recommendations, risk_assessment, confidence_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, ai_rows)
             
             # Update tool statistics
-            self._update_tool_stats(conn, result.tool, result.success, result.duration)
+            self._update_tool_stats(conn, [(result.tool, result.success, result.duration) for result, _ in items])
             
             # Update target information
-            self._update_target_info(conn, result.target)
-    
-    def _update_tool_stats(self, conn, tool_name: str, success: bool, duration: float):
-        """Update tool usage statistics"""
-        conn.execute("""
-            INSERT OR REPLACE INTO tool_stats (tool_name, usage_count, success_rate, avg_duration, last_used)
-            VALUES (
-                ?,
-                COALESCE((SELECT usage_count FROM tool_stats WHERE tool_name = ?), 0) + 1,
-                CASE 
-                    WHEN COALESCE((SELECT usage_count FROM tool_stats WHERE tool_name = ?), 0) = 0 THEN ?
-                    ELSE (COALESCE((SELECT success_rate * usage_count FROM tool_stats WHERE tool_name = ?), 0) + ?) / 
-                         (COALESCE((SELECT usage_count FROM tool_stats WHERE tool_name = ?), 0) + 1)
-                END,
-                CASE 
-                    WHEN COALESCE((SELECT usage_count FROM tool_stats WHERE tool_name = ?), 0) = 0 THEN ?
-                    ELSE (COALESCE((SELECT avg_duration * usage_count FROM tool_stats WHERE tool_name = ?), 0) + ?) / 
-                         (COALESCE((SELECT usage_count FROM tool_stats WHERE tool_name = ?), 0) + 1)
-                END,
-                CURRENT_TIMESTAMP
-            )
-        """, (tool_name, tool_name, tool_name, 1.0 if success else 0.0, tool_name, 1.0 if success else 0.0, tool_name, tool_name, duration, tool_name, duration, tool_name))
-    
-    def _update_target_info(self, conn, target: str):
+            self._update_target_info(conn, [result.target for result, _ in items])
+    
+    def _update_tool_stats(self, conn, stats: List[Tuple[str, bool, float]]):
+        """Update tool usage statistics from (tool_name, success, duration) rows"""
+        conn.executemany("""
+            INSERT INTO tool_stats (tool_name, usage_count, success_rate, avg_duration, last_used)
+            VALUES (?, 1, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(tool_name) DO UPDATE SET
+                success_rate = (success_rate * usage_count + excluded.success_rate) / (usage_count + 1),
+                avg_duration = (avg_duration * usage_count + excluded.avg_duration) / (usage_count + 1),
+                usage_count = usage_count + 1,
+                last_used = CURRENT_TIMESTAMP
+        """, [(tool_name, 1.0 if success else 0.0, duration) for tool_name, success, duration in stats])
+    
+    def _update_target_info(self, conn, targets: List[str]):
         """Update target scan information"""
-        conn.execute("""
-            INSERT OR REPLACE INTO targets (target, first_scan, last_scan, total_scans)
-            VALUES (
-                ?,
-                COALESCE((SELECT first_scan FROM targets WHERE target = ?), CURRENT_TIMESTAMP),
-                CURRENT_TIMESTAMP,
-                COALESCE((SELECT total_scans FROM targets WHERE target = ?), 0) + 1
-            )
-        """, (target, target, target))
+        conn.executemany("""
+            INSERT INTO targets (target, first_scan, last_scan, total_scans)
+            VALUES (?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1)
+            ON CONFLICT(target) DO UPDATE SET
+                last_scan = CURRENT_TIMESTAMP,
+                total_scans = total_scans + 1
+        """, [(target,) for target in targets])
+    
+    def get_ai_cache(self, key: str, ttl_days: int = 7) -> Optional[AIAnalysis]:
+        """Get a cached AI analysis if one was stored within the last ttl_days"""
+        with self._reading() as conn:
+            row = conn.execute("""
+                SELECT payload FROM ai_cache
+                WHERE key = ? AND created >= datetime('now', ?)
+            """, (key, f"-{int(ttl_days)} days")).fetchone()
+        
+        if not row:
+            return None
+        return AIAnalysis(**json.loads(row[0]))
+    
+    def put_ai_cache(self, key: str, ai_analysis: AIAnalysis):
+        """Store an AI analysis in the cache, replacing any older entry"""
+        with self._transaction() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO ai_cache (key, payload, created)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            """, (key, _json_dumps(asdict(ai_analysis))))
+    
+    def _cutoff(self, days: int) -> int:
+        """Unix timestamp for N days ago, bound as a query parameter"""
+        return int(time.time()) - int(days) * 86400
     
     def get_scan_results(self, days: int = 7, limit: int = 100):
         """Get scan results from the last N days"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._reading() as conn:
             cursor = conn.execute("""
                 SELECT tool, target, command, output, exit_code, duration, timestamp, success, 
                        risk_level, vulnerabilities_found
                 FROM scan_results 
-                WHERE timestamp >= datetime('now', '-{} days')
+                WHERE timestamp >= ?
                 ORDER BY timestamp DESC 
                 LIMIT ?
-            """.format(days), (limit,))
+            """, (self._cutoff(days), limit))
             return cursor.fetchall()
     
     def get_ai_analyses(self, days: int = 7, limit: int = 50):
         """Get AI analyses from the last N days"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._reading() as conn:
             cursor = conn.execute("""
                 SELECT sa.model_used, sa.summary, sa.findings, sa.recommendations, 
                        sa.risk_assessment, sa.confidence_score
                 FROM ai_analysis sa
                 JOIN scan_results sr ON sa.scan_result_id = sr.id
-                WHERE sr.timestamp >= datetime('now', '-{} days')
+                WHERE sr.timestamp >= ?
                 ORDER BY sa.timestamp DESC
                 LIMIT ?
-            """.format(days), (limit,))
+            """, (self._cutoff(days), limit))
             return cursor.fetchall()
     
     def get_database_stats(self):
         """Get database statistics"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._reading() as conn:
             stats = {}
             
             # Total scan results
@@ -212,8 +309,10 @@ class EnhancedDatabaseManager:
             cursor = conn.execute("SELECT COUNT(*) FROM targets")
             stats['total_targets'] = cursor.fetchone()[0]
             
-            # Database size
-            cursor = conn.execute("SELECT page_count * page_size as size FROM pragma_page_count(), pragma_page_size()")
-            stats['db_size'] = cursor.fetchone()[0]
+            # Database size, including pages still sitting in the WAL file
+            stats['db_size'] = os.path.getsize(self.db_path)
+            wal_path = self.db_path + '-wal'
+            if os.path.exists(wal_path):
+                stats['db_size'] += os.path.getsize(wal_path)
             
             return stats
@@ -5,194 +5,321 @@ Tool management for HackAI Enhanced
 
 import subprocess
 import asyncio
+import codecs
+import functools
+import gzip
+import os
+import re
+import shlex
+import sys
 import time
-from typing import Dict, List, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from core.models import ToolConfig, ScanResult
 from core.colors import Colors
 
+# keyword -> (counts as a vulnerability hit, risk rank it implies)
+_VULN_KEYWORDS = {
+    "vulnerability": (1, 0), "cve": (1, 0),
+    "critical": (1, 3), "vulnerable": (1, 3), "exploit": (1, 3),
+    "high": (1, 2), "dangerous": (0, 2), "severe": (0, 2),
+    "medium": (1, 1), "warning": (0, 1), "caution": (0, 1),
+}
+_RISK_BY_RANK = ("low", "medium", "high", "critical")
+# Keywords are factored by shared prefix and matched case-sensitively against
+# lowercased text, which CPython's re scans several times faster than IGNORECASE
+_VULN_RE = re.compile(r"c(?:ve|ritical|aution)|vulnerab(?:ility|le)|exploit|high|dangerous|severe|medium|warning")
+
+# Package managers that accept several packages in one invocation
+_BATCH_INSTALLERS = {("apt", "install"), ("pip3", "install"), ("cargo", "install"), ("gem", "install")}
+
+# Only the last OUTPUT_TAIL_CHARS of a tool's stdout are kept in memory; the
+# full output of anything longer is streamed to OUTPUT_DIR/<session>/<tool>.gz
+OUTPUT_TAIL_CHARS = 64 * 1024
+OUTPUT_DIR = Path("outputs")
+_READ_CHUNK = 64 * 1024
+
+def _build_tools() -> Dict[str, ToolConfig]:
+    """Initialize comprehensive tool configuration with 150+ tools from HackAI AI v6.0"""
+    tools = {
+        # Network Discovery & Port Scanning (Enhanced)
+        "nmap": ToolConfig("nmap", "nmap", "network", "Network port scanner and service detection", 
+                         "apt install nmap -y", "which nmap", "nmap --version",
+                         common_args=["-sV", "-sC", "--top-ports", "1000"]),
+        "masscan": ToolConfig("masscan", "masscan", "network", "High-speed Internet-scale port scanner",
+                            "apt install masscan -y", "which masscan", "masscan --version",
+                            common_args=["--rate=1000", "-p1-65535"]),
+        "rustscan": ToolConfig("rustscan", "rustscan", "network", "Ultra-fast port scanner written in Rust",
+                             "cargo install rustscan", "which rustscan", "rustscan --version",
+                             common_args=["-a", "--ulimit", "5000"]),
+        "autorecon": ToolConfig("autorecon", "autorecon", "network", "Automated reconnaissance tool",
+                              "pip3 install autorecon", "which autorecon", "autorecon --version"),
+        "netexec": ToolConfig("netexec", "netexec", "network", "Network exploitation tool",
+                            "pip3 install netexec", "which netexec", "netexec --version"),
+        "responder": ToolConfig("responder", "responder", "network", "LLMNR/NBT-NS/mDNS poisoner",
+                             "apt install responder -y", "which responder", "responder --version"),
+        
+        # Web Application Testing (Enhanced)
+        "gobuster": ToolConfig("gobuster", "gobuster", "web", "Directory/file brute-forcer",
+                             "apt install gobuster -y", "which gobuster", "gobuster version",
+                             common_args=["dir", "-w", "/usr/share/wordlists/dirb/common.txt", "-u"]),
+        "feroxbuster": ToolConfig("feroxbuster", "feroxbuster", "web", "Fast content discovery tool",
+                                "cargo install feroxbuster", "which feroxbuster", "feroxbuster --version",
+                                common_args=["-u", "-w", "/usr/share/wordlists/dirb/common.txt"]),
+        "dirsearch": ToolConfig("dirsearch", "dirsearch", "web", "Web path scanner",
+                              "pip3 install dirsearch", "which dirsearch", "dirsearch --version",
+                              common_args=["-u", "-e", "php,html,js"]),
+        "ffuf": ToolConfig("ffuf", "ffuf", "web", "Fast web fuzzer written in Go",
+                         "go install github.com/ffuf/ffuf/v2@latest", "which ffuf", "ffuf -V",
+                         common_args=["-w", "/usr/share/wordlists/dirb/common.txt", "-u"]),
+        "katana": ToolConfig("katana", "katana", "web", "Advanced web crawling and discovery",
+                           "go install github.com/projectdiscovery/katana/cmd/katana@latest", "which katana", "katana -version"),
+        "arjun": ToolConfig("arjun", "arjun", "web", "HTTP parameter discovery suite",
+                          "pip3 install arjun", "which arjun", "arjun --version"),
+        "paramspider": ToolConfig("paramspider", "paramspider", "web", "Mining parameters from dark corners",
+                                "pip3 install paramspider", "which paramspider", "paramspider --version"),
+        "x8": ToolConfig("x8", "x8", "web", "HTTP parameter brute forcer",
+                       "go install github.com/Sh1Yo/x8@latest", "which x8", "x8 --version"),
+        "jaeles": ToolConfig("jaeles", "jaeles", "web", "Advanced web application scanner",
+                           "go install github.com/jaeles-project/jaeles@latest", "which jaeles", "jaeles --version"),
+        "dalfox": ToolConfig("dalfox", "dalfox", "web", "XSS scanner and parameter analyzer",
+                           "go install github.com/hahwul/dalfox/v2@latest", "which dalfox", "dalfox --version"),
+        
+        # Vulnerability Scanners
+        "nuclei": ToolConfig("nuclei", "nuclei", "vuln", "Fast vulnerability scanner",
+                           "go install -v github.com/projectdiscovery/nuclei/v3/cmd/nuclei@latest",
+                           "which nuclei", "nuclei -version",
+                           common_args=["-t", "nuclei-templates/", "-severity", "medium,high,critical"]),
+        "httpx": ToolConfig("httpx", "httpx", "web", "Fast HTTP toolkit",
+                          "go install -v github.com/projectdiscovery/httpx/cmd/httpx@latest",
+                          "which httpx", "httpx -version",
+                          common_args=["-status-code", "-title", "-tech-detect"]),
+        "nikto": ToolConfig("nikto", "nikto", "web", "Web server scanner",
+                          "apt install nikto -y", "which nikto", "nikto -Version",
+                          common_args=["-h"]),
+        
+        # SQL Injection Testing
+        "sqlmap": ToolConfig("sqlmap", "sqlmap", "web", "Automatic SQL injection tool",
+                           "apt install sqlmap -y", "which sqlmap", "sqlmap --version",
+                           common_args=["-u", "--batch", "--level=2"]),
+        
+        # Authentication & Password Testing
+        "hydra": ToolConfig("hydra", "hydra", "auth", "Network login cracker",
+                          "apt install hydra -y", "which hydra", "hydra -h"),
+        "john": ToolConfig("john", "john", "auth", "Password cracker",
+                         "apt install john -y", "which john", "john --version"),
+        "hashcat": ToolConfig("hashcat", "hashcat", "auth", "Advanced password recovery",
+                            "apt install hashcat -y", "which hashcat", "hashcat --version"),
+        
+        # Subdomain Enumeration & DNS
+        "subfinder": ToolConfig("subfinder", "subfinder", "recon", "Passive subdomain discovery",
+                              "go install -v github.com/projectdiscovery/subfinder/v2/cmd/subfinder@latest",
+                              "which subfinder", "subfinder -version",
+                              common_args=["-d"]),
+        "amass": ToolConfig("amass", "amass", "recon", "Attack surface mapping and asset discovery",
+                          "apt install amass -y", "which amass", "amass version",
+                          common_args=["enum", "-d"]),
+        
+        # OSINT Tools
+        "theharvester": ToolConfig("theharvester", "theharvester", "osint", "Email, domain, employee harvesting",
+                                 "pip3 install theharvester", "which theharvester", "theharvester --version"),
+        "shodan": ToolConfig("shodan", "shodan", "osint", "Shodan CLI",
+                           "pip3 install shodan", "which shodan", "shodan version"),
+        
+        # Network Analysis
+        "wireshark": ToolConfig("wireshark", "wireshark", "network", "Network protocol analyzer",
+                              "apt install wireshark -y", "which wireshark", "wireshark --version"),
+        "tcpdump": ToolConfig("tcpdump", "tcpdump", "network", "Command-line packet analyzer",
+                            "apt install tcpdump -y", "which tcpdump", "tcpdump --version"),
+        
+        # Binary Analysis (Enhanced)
+        "binwalk": ToolConfig("binwalk", "binwalk", "binary", "Firmware analysis tool",
+                            "apt install binwalk -y", "which binwalk", "binwalk --version"),
+        "strings": ToolConfig("strings", "strings", "binary", "Extract strings from binaries",
+                            "apt install binutils -y", "which strings", "strings --version"),
+        "ghidra": ToolConfig("ghidra", "ghidra", "binary", "Software reverse engineering framework",
+                           "apt install ghidra -y", "which ghidra", "ghidra --version"),
+        "radare2": ToolConfig("radare2", "radare2", "binary", "Advanced reverse engineering framework",
+                            "apt install radare2 -y", "which radare2", "radare2 --version"),
+        "pwntools": ToolConfig("pwntools", "python3 -m pwn", "binary", "CTF framework and exploit development",
+                             "pip3 install pwntools", "python3 -c 'import pwn'", "python3 -c 'import pwn; print(pwn.__version__)'"),
+        "ropgadget": ToolConfig("ropgadget", "ropgadget", "binary", "ROP gadget finder and binary analyzer",
+                              "pip3 install ropgadget", "which ropgadget", "ropgadget --version"),
+        "one_gadget": ToolConfig("one_gadget", "one_gadget", "binary", "Find one_gadget in glibc",
+                               "gem install one_gadget", "which one_gadget", "one_gadget --version"),
+        "angr": ToolConfig("angr", "angr", "binary", "Platform-agnostic binary analysis framework",
+                         "pip3 install angr", "python3 -c 'import angr'", "python3 -c 'import angr; print(angr.__version__)'"),
+        
+        # Cloud Security (Enhanced)
+        "prowler": ToolConfig("prowler", "prowler", "cloud", "AWS/Azure/GCP security tool",
+                            "pip3 install prowler", "which prowler", "prowler --version"),
+        "trivy": ToolConfig("trivy", "trivy", "cloud", "Container vulnerability scanner",
+                          "apt install trivy -y", "which trivy", "trivy --version"),
+        "scoutsuite": ToolConfig("scoutsuite", "scout", "cloud", "Multi-cloud security auditing tool",
+                               "pip3 install scoutsuite", "which scout", "scout --version"),
+        "cloudmapper": ToolConfig("cloudmapper", "cloudmapper", "cloud", "Cloud infrastructure visualization",
+                                "pip3 install cloudmapper", "which cloudmapper", "cloudmapper --version"),
+        "pacu": ToolConfig("pacu", "pacu", "cloud", "AWS exploitation framework",
+                         "pip3 install pacu", "which pacu", "pacu --version"),
+        "kube-hunter": ToolConfig("kube-hunter", "kube-hunter", "cloud", "Kubernetes security testing",
+                                "pip3 install kube-hunter", "which kube-hunter", "kube-hunter --version"),
+        "kube-bench": ToolConfig("kube-bench", "kube-bench", "cloud", "Kubernetes benchmark assessment",
+                               "go install github.com/aquasecurity/kube-bench/cmd/kube-bench@latest", "which kube-bench", "kube-bench --version"),
+        
+        # Container Security
+        "docker-bench": ToolConfig("docker-bench", "docker-bench-security", "container", "Docker security benchmark",
+                                 "docker run --rm --net host --pid host --userns host --cap-add audit_control",
+                                 "docker --version", "docker --version"),
+        
+        # Mobile Security
+        "mobsf": ToolConfig("mobsf", "mobsf", "mobile", "Mobile Security Framework",
+                          "pip3 install mobsf", "which mobsf", "mobsf --version"),
+        "apktool": ToolConfig("apktool", "apktool", "mobile", "Android APK reverse engineering",
+                            "apt install apktool -y", "which apktool", "apktool --version"),
+        
+        # Forensics
+        "autopsy": ToolConfig("autopsy", "autopsy", "forensics", "Digital forensics platform",
+                            "apt install autopsy -y", "which autopsy", "autopsy --version"),
+        "volatility": ToolConfig("volatility", "volatility", "forensics", "Memory forensics framework",
+                               "pip3 install volatility3", "which volatility", "volatility --version"),
+        
+        # Wireless Security
+        "aircrack-ng": ToolConfig("aircrack-ng", "aircrack-ng", "wireless", "WiFi security auditing tools",
+                                "apt install aircrack-ng -y", "which aircrack-ng", "aircrack-ng --help"),
+        "wifite": ToolConfig("wifite", "wifite", "wireless", "Automated wireless attack tool",
+                           "apt install wifite -y", "which wifite", "wifite --help"),
+        
+        # Social Engineering
+        "setoolkit": ToolConfig("setoolkit", "setoolkit", "social", "Social Engineer Toolkit",
+                              "apt install set -y", "which setoolkit", "setoolkit --version"),
+        
+        # Exploitation
+        "metasploit": ToolConfig("metasploit", "msfconsole", "exploitation", "Penetration testing framework",
+                               "apt install metasploit-framework -y", "which msfconsole", "msfconsole --version"),
+        "exploitdb": ToolConfig("exploitdb", "searchsploit", "exploitation", "Exploit database search tool",
+                              "apt install exploitdb -y", "which searchsploit", "searchsploit --version")
+    }
+    
+    return tools
+
+# The registry is built once per process; each ToolManager takes a shallow copy
+_TOOLS = _build_tools()
+
 class ToolManager:
-    """Manages security tools and their execution"""
+    """Manages security tools and their execution
+    
+    At most HACKAI_MAX_CONCURRENT tools (default 8) run at the same time;
+    further execute_tool calls wait for a free slot.
+    """
     
     def __init__(self):
-        self.tools = self._init_comprehensive_tools()
+        self.tools = dict(_TOOLS)
+        # Category index for list_tools, rebuilt whenever self.tools has been changed
+        self._by_category: Dict[str, List[str]] = {}
+        self._indexed_tools = None
+        self.max_concurrent_tools = int(os.getenv("HACKAI_MAX_CONCURRENT", "8"))
+        self._sem = None
+        self._sem_loop = None
+        
+        # Availability probes fork one process per tool, so reuse results for avail_ttl seconds
+        self.avail_ttl = 60.0
+        self._availability_cache = None
+        self._avail_ts = 0.0
+        # $PATH directory -> (mtime, entry names), so unchanged directories are not re-listed
+        self._path_index: Dict[str, Tuple[float, frozenset]] = {}
+        # Worker threads for blocking probes and installs, created on first use
+        self._pool = None
     
-    def _init_comprehensive_tools(self) -> Dict[str, ToolConfig]:
-        """Initialize comprehensive tool configuration with 150+ tools from HackAI AI v6.0"""
-        tools = {
-            # Network Discovery & Port Scanning (Enhanced)
-            "nmap": ToolConfig("nmap", "nmap", "network", "Network port scanner and service detection", 
-                             "apt install nmap -y", "which nmap", "nmap --version",
-                             common_args=["-sV", "-sC", "--top-ports", "1000"]),
-            "masscan": ToolConfig("masscan", "masscan", "network", "High-speed Internet-scale port scanner",
-                                "apt install masscan -y", "which masscan", "masscan --version",
-                                common_args=["--rate=1000", "-p1-65535"]),
-            "rustscan": ToolConfig("rustscan", "rustscan", "network", "Ultra-fast port scanner written in Rust",
-                                 "cargo install rustscan", "which rustscan", "rustscan --version",
-                                 common_args=["-a", "--ulimit", "5000"]),
-            "autorecon": ToolConfig("autorecon", "autorecon", "network", "Automated reconnaissance tool",
-                                  "pip3 install autorecon", "which autorecon", "autorecon --version"),
-            "netexec": ToolConfig("netexec", "netexec", "network", "Network exploitation tool",
-                                "pip3 install netexec", "which netexec", "netexec --version"),
-            "responder": ToolConfig("responder", "responder", "network", "LLMNR/NBT-NS/mDNS poisoner",
-                                 "apt install responder -y", "which responder", "responder --version"),
-            
-            # Web Application Testing (Enhanced)
-            "gobuster": ToolConfig("gobuster", "gobuster", "web", "Directory/file brute-forcer",
-                                 "apt install gobuster -y", "which gobuster", "gobuster version",
-                                 common_args=["dir", "-w", "/usr/share/wordlists/dirb/common.txt", "-u"]),
-            "feroxbuster": ToolConfig("feroxbuster", "feroxbuster", "web", "Fast content discovery tool",
-                                    "cargo install feroxbuster", "which feroxbuster", "feroxbuster --version",
-                                    common_args=["-u", "-w", "/usr/share/wordlists/dirb/common.txt"]),
-            "dirsearch": ToolConfig("dirsearch", "dirsearch", "web", "Web path scanner",
-                                  "pip3 install dirsearch", "which dirsearch", "dirsearch --version",
-                                  common_args=["-u", "-e", "php,html,js"]),
-            "ffuf": ToolConfig("ffuf", "ffuf", "web", "Fast web fuzzer written in Go",
-                             "go install github.com/ffuf/ffuf/v2@latest", "which ffuf", "ffuf -V",
-                             common_args=["-w", "/usr/share/wordlists/dirb/common.txt", "-u"]),
-            "katana": ToolConfig("katana", "katana", "web", "Advanced web crawling and discovery",
-                               "go install github.com/projectdiscovery/katana/cmd/katana@latest", "which katana", "katana -version"),
-            "arjun": ToolConfig("arjun", "arjun", "web", "HTTP parameter discovery suite",
-                              "pip3 install arjun", "which arjun", "arjun --version"),
-            "paramspider": ToolConfig("paramspider", "paramspider", "web", "Mining parameters from dark corners",
-                                    "pip3 install paramspider", "which paramspider", "paramspider --version"),
-            "x8": ToolConfig("x8", "x8", "web", "HTTP parameter brute forcer",
-                           "go install github.com/Sh1Yo/x8@latest", "which x8", "x8 --version"),
-            "jaeles": ToolConfig("jaeles", "jaeles", "web", "Advanced web application scanner",
-                               "go install github.com/jaeles-project/jaeles@latest", "which jaeles", "jaeles --version"),
-            "dalfox": ToolConfig("dalfox", "dalfox", "web", "XSS scanner and parameter analyzer",
-                               "go install github.com/hahwul/dalfox/v2@latest", "which dalfox", "dalfox --version"),
-            
-            # Vulnerability Scanners
-            "nuclei": ToolConfig("nuclei", "nuclei", "vuln", "Fast vulnerability scanner",
-                               "go install -v github.com/projectdiscovery/nuclei/v3/cmd/nuclei@latest",
-                               "which nuclei", "nuclei -version",
-                               common_args=["-t", "nuclei-templates/", "-severity", "medium,high,critical"]),
-            "httpx": ToolConfig("httpx", "httpx", "web", "Fast HTTP toolkit",
-                              "go install -v github.com/projectdiscovery/httpx/cmd/httpx@latest",
-                              "which httpx", "httpx -version",
-                              common_args=["-status-code", "-title", "-tech-detect"]),
-            "nikto": ToolConfig("nikto", "nikto", "web", "Web server scanner",
-                              "apt install nikto -y", "which nikto", "nikto -Version",
-                              common_args=["-h"]),
-            
-            # SQL Injection Testing
-            "sqlmap": ToolConfig("sqlmap", "sqlmap", "web", "Automatic SQL injection tool",
-                               "apt install sqlmap -y", "which sqlmap", "sqlmap --version",
-                               common_args=["-u", "--batch", "--level=2"]),
-            
-            # Authentication & Password Testing
-            "hydra": ToolConfig("hydra", "hydra", "auth", "Network login cracker",
-                              "apt install hydra -y", "which hydra", "hydra -h"),
-            "john": ToolConfig("john", "john", "auth", "Password cracker",
-                             "apt install john -y", "which john", "john --version"),
-            "hashcat": ToolConfig("hashcat", "hashcat", "auth", "Advanced password recovery",
-                                "apt install hashcat -y", "which hashcat", "hashcat --version"),
-            
-            # Subdomain Enumeration & DNS
-            "subfinder": ToolConfig("subfinder", "subfinder", "recon", "Passive subdomain discovery",
-                                  "go install -v github.com/projectdiscovery/subfinder/v2/cmd/subfinder@latest",
-                                  "which subfinder", "subfinder -version",
-                                  common_args=["-d"]),
-            "amass": ToolConfig("amass", "amass", "recon", "Attack surface mapping and asset discovery",
-                              "apt install amass -y", "which amass", "amass version",
-                              common_args=["enum", "-d"]),
-            
-            # OSINT Tools
-            "theharvester": ToolConfig("theharvester", "theharvester", "osint", "Email, domain, employee harvesting",
-                                     "pip3 install theharvester", "which theharvester", "theharvester --version"),
-            "shodan": ToolConfig("shodan", "shodan", "osint", "Shodan CLI",
-                               "pip3 install shodan", "which shodan", "shodan version"),
-            
-            # Network Analysis
-            "wireshark": ToolConfig("wireshark", "wireshark", "network", "Network protocol analyzer",
-                                  "apt install wireshark -y", "which wireshark", "wireshark --version"),
-            "tcpdump": ToolConfig("tcpdump", "tcpdump", "network", "Command-line packet analyzer",
-                                "apt install tcpdump -y", "which tcpdump", "tcpdump --version"),
-            
-            # Binary Analysis (Enhanced)
-            "binwalk": ToolConfig("binwalk", "binwalk", "binary", "Firmware analysis tool",
-                                "apt install binwalk -y", "which binwalk", "binwalk --version"),
-            "strings": ToolConfig("strings", "strings", "binary", "Extract strings from binaries",
-                                "apt install binutils -y", "which strings", "strings --version"),
-            "ghidra": ToolConfig("ghidra", "ghidra", "binary", "Software reverse engineering framework",
-                               "apt install ghidra -y", "which ghidra", "ghidra --version"),
-            "radare2": ToolConfig("radare2", "radare2", "binary", "Advanced reverse engineering framework",
-                                "apt install radare2 -y", "which radare2", "radare2 --version"),
-            "pwntools": ToolConfig("pwntools", "python3 -m pwn", "binary", "CTF framework and exploit development",
-                                 "pip3 install pwntools", "python3 -c 'import pwn'", "python3 -c 'import pwn; print(pwn.__version__)'"),
-            "ropgadget": ToolConfig("ropgadget", "ropgadget", "binary", "ROP gadget finder and binary analyzer",
-                                  "pip3 install ropgadget", "which ropgadget", "ropgadget --version"),
-            "one_gadget": ToolConfig("one_gadget", "one_gadget", "binary", "Find one_gadget in glibc",
-                                   "gem install one_gadget", "which one_gadget", "one_gadget --version"),
-            "angr": ToolConfig("angr", "angr", "binary", "Platform-agnostic binary analysis framework",
-                             "pip3 install angr", "python3 -c 'import angr'", "python3 -c 'import angr; print(angr.__version__)'"),
-            
-            # Cloud Security (Enhanced)
-            "prowler": ToolConfig("prowler", "prowler", "cloud", "AWS/Azure/GCP security tool",
-                                "pip3 install prowler", "which prowler", "prowler --version"),
-            "trivy": ToolConfig("trivy", "trivy", "cloud", "Container vulnerability scanner",
-                              "apt install trivy -y", "which trivy", "trivy --version"),
-            "scoutsuite": ToolConfig("scoutsuite", "scout", "cloud", "Multi-cloud security auditing tool",
-                                   "pip3 install scoutsuite", "which scout", "scout --version"),
-            "cloudmapper": ToolConfig("cloudmapper", "cloudmapper", "cloud", "Cloud infrastructure visualization",
-                                    "pip3 install cloudmapper", "which cloudmapper", "cloudmapper --version"),
-            "pacu": ToolConfig("pacu", "pacu", "cloud", "AWS exploitation framework",
-                             "pip3 install pacu", "which pacu", "pacu --version"),
-            "kube-hunter": ToolConfig("kube-hunter", "kube-hunter", "cloud", "Kubernetes security testing",
-                                    "pip3 install kube-hunter", "which kube-hunter", "kube-hunter --version"),
-            "kube-bench": ToolConfig("kube-bench", "kube-bench", "cloud", "Kubernetes benchmark assessment",
-                                   "go install github.com/aquasecurity/kube-bench/cmd/kube-bench@latest", "which kube-bench", "kube-bench --version"),
-            
-            # Container Security
-            "docker-bench": ToolConfig("docker-bench", "docker-bench-security", "container", "Docker security benchmark",
-                                     "docker run --rm --net host --pid host --userns host --cap-add audit_control",
-                                     "docker --version", "docker --version"),
-            
-            # Mobile Security
-            "mobsf": ToolConfig("mobsf", "mobsf", "mobile", "Mobile Security Framework",
-                              "pip3 install mobsf", "which mobsf", "mobsf --version"),
-            "apktool": ToolConfig("apktool", "apktool", "mobile", "Android APK reverse engineering",
-                                "apt install apktool -y", "which apktool", "apktool --version"),
-            
-            # Forensics
-            "autopsy": ToolConfig("autopsy", "autopsy", "forensics", "Digital forensics platform",
-                                "apt install autopsy -y", "which autopsy", "autopsy --version"),
-            "volatility": ToolConfig("volatility", "volatility", "forensics", "Memory forensics framework",
-                                   "pip3 install volatility3", "which volatility", "volatility --version"),
-            
-            # Wireless Security
-            "aircrack-ng": ToolConfig("aircrack-ng", "aircrack-ng", "wireless", "WiFi security auditing tools",
-                                    "apt install aircrack-ng -y", "which aircrack-ng", "aircrack-ng --help"),
-            "wifite": ToolConfig("wifite", "wifite", "wireless", "Automated wireless attack tool",
-                               "apt install wifite -y", "which wifite", "wifite --help"),
-            
-            # Social Engineering
-            "setoolkit": ToolConfig("setoolkit", "setoolkit", "social", "Social Engineer Toolkit",
-                                  "apt install set -y", "which setoolkit", "setoolkit --version"),
-            
-            # Exploitation
-            "metasploit": ToolConfig("metasploit", "msfconsole", "exploitation", "Penetration testing framework",
-                                   "apt install metasploit-framework -y", "which msfconsole", "msfconsole --version"),
-            "exploitdb": ToolConfig("exploitdb", "searchsploit", "exploitation", "Exploit database search tool",
-                                  "apt install exploitdb -y", "which searchsploit", "searchsploit --version")
-        }
-        
-        return tools
+    def _executor(self) -> ThreadPoolExecutor:
+        """Return the shared worker pool, creating it on first use"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=16)
+        return self._pool
+    
+    def close(self):
+        """Shut down the shared worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _categories(self) -> Dict[str, List[str]]:
+        """Return tool names grouped by category, with the categories already sorted for display
+        
+        The index is only rebuilt when self.tools no longer matches the snapshot it
+        was built from; that comparison is a C-level identity check per entry.
+        """
+        if self._indexed_tools != self.tools:
+            by_category = defaultdict(list)
+            for name, tool in self.tools.items():
+                by_category[tool.category].append(name)
+            self._by_category = {cat: by_category[cat] for cat in sorted(by_category)}
+            self._indexed_tools = dict(self.tools)
+        return self._by_category
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_concurrent_tools)
+            self._sem_loop = loop
+        return self._sem
+    
+    def check_tool_availability(self, refresh: bool = False) -> Dict[str, bool]:
+        """Check which tools are available on the system, reusing recent results unless refresh is set"""
+        if (not refresh and self._availability_cache is not None
+                and time.monotonic() - self._avail_ts < self.avail_ttl):
+            return dict(self._availability_cache)
+        
+        self._refresh_path_index()
+        
+        # The probes are independent and I/O bound, so run them side by side
+        results = self._executor().map(self._check_one, self.tools.values())
+        availability = dict(zip(self.tools, results))
+        
+        self._availability_cache = availability
+        self._avail_ts = time.monotonic()
+        return dict(availability)
+    
+    def _check_one(self, tool: ToolConfig) -> bool:
+        """Run a single tool's availability check"""
+        try:
+            if not tool.check_cmd:
+                return False
+            # "which X" is answered from the $PATH index; only real probes (imports, docker) fork
+            if tool.check_cmd[0] == "which" and len(tool.check_cmd) == 2:
+                return self._on_path(tool.check_cmd[1])
+            result = subprocess.run(tool.check_cmd, 
+                                  capture_output=True, text=True, timeout=5)
+            return result.returncode == 0
+        except Exception:
+            return False
     
-    def check_tool_availability(self) -> Dict[str, bool]:
-        """Check which tools are available on the system"""
-        availability = {}
-        for name, tool in self.tools.items():
+    def _refresh_path_index(self):
+        """List each $PATH directory once, reusing the previous listing while its mtime is unchanged"""
+        index = {}
+        for directory in os.get_exec_path():
             try:
-                if tool.check_cmd:
-                    result = subprocess.run(tool.check_cmd.split(), 
-                                          capture_output=True, text=True, timeout=5)
-                    availability[name] = result.returncode == 0
-                else:
-                    availability[name] = False
-            except Exception:
-                availability[name] = False
-        return availability
+                mtime = os.stat(directory).st_mtime
+                cached = self._path_index.get(directory)
+                if cached is None or cached[0] != mtime:
+                    cached = (mtime, frozenset(os.listdir(directory)))
+                index[directory] = cached
+            except OSError:
+                continue
+        self._path_index = index
+    
+    def _on_path(self, name: str) -> bool:
+        """Check whether an executable called name is in one of the indexed $PATH directories"""
+        return any(name in names and os.access(os.path.join(directory, name), os.X_OK)
+                   for directory, (_, names) in self._path_index.items())
     
     async def execute_tool(self, tool_name: str, args: List[str], target: str = "", session_id: str = "") -> ScanResult:
         """Execute a security tool"""
@@ -200,41 +327,53 @@ class ToolManager:
             raise ValueError(f"Tool {tool_name} not found")
         
         tool = self.tools[tool_name]
+        
+        # Build command before the try so every result branch can report it
+        cmd = [tool.command, *tool.common_args, *args]
+        if target and tool.requires_target:
+            cmd.append(target)
+        command = shlex.join(cmd)
         start_time = time.time()
         
         try:
-            # Build command
-            cmd = [tool.command] + (tool.common_args or []) + args
-            if target and tool.requires_target:
-                cmd.append(target)
-            
-            # Execute tool
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            # Execute tool as an asyncio subprocess so concurrent scans share the event loop;
+            # stderr is never read, so it goes to DEVNULL rather than a pipe that could fill up
+            async with self._semaphore():
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+                try:
+                    output, vulnerabilities, rank, output_path = await asyncio.wait_for(
+                        self._collect([proc], tool_name, session_id), timeout=300)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise
             duration = time.time() - start_time
             
             # Create scan result
             scan_result = ScanResult(
                 tool=tool_name,
                 target=target,
-                command=" ".join(cmd),
-                output=result.stdout,
-                exit_code=result.returncode,
+                command=command,
+                output=output,
+                exit_code=proc.returncode,
                 duration=duration,
                 timestamp=time.time(),
-                success=result.returncode == 0,
+                success=proc.returncode == 0,
                 session_id=session_id,
-                risk_level=self._assess_risk_level(result.stdout, tool_name),
-                vulnerabilities_found=self._count_vulnerabilities(result.stdout, tool_name)
+                risk_level=_RISK_BY_RANK[rank],
+                vulnerabilities_found=vulnerabilities,
+                output_path=output_path
             )
             
             return scan_result
             
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             duration = time.time() - start_time
             return ScanResult(
                 tool=tool_name,
                 target=target,
-                command=" ".join(cmd),
+                command=command,
                 output="Tool execution timed out",
                 exit_code=-1,
                 duration=duration,
@@ -249,7 +388,7 @@ class ToolManager:
             return ScanResult(
                 tool=tool_name,
                 target=target,
-                command=" ".join(cmd),
+                command=command,
                 output=f"Error: {str(e)}",
                 exit_code=-1,
                 duration=duration,
@@ -260,73 +399,216 @@ class ToolManager:
                 vulnerabilities_found=0
             )
     
-    def _count_vulnerabilities(self, output: str, tool_name: str) -> int:
-        """Count vulnerabilities in tool output"""
-        vuln_keywords = ["vulnerability", "vulnerable", "cve", "exploit", "critical", "high", "medium"]
-        count = 0
-        output_lower = output.lower()
+    async def gather_tools(self, specs: List[Dict[str, Any]]) -> List[ScanResult]:
+        """Execute several tools concurrently, each spec holding execute_tool keyword arguments"""
+        return await asyncio.gather(*(self.execute_tool(**spec) for spec in specs))
+    
+    async def chain_tools(self, stages: List[Tuple[str, List[str]]], target: str = "", session_id: str = "") -> ScanResult:
+        """Execute tools as a pipeline (e.g. subfinder | httpx | nuclei), each stage reading the previous one's stdout
         
-        for keyword in vuln_keywords:
-            count += output_lower.count(keyword)
+        Stages are connected with OS pipes, so data streams between the processes
+        without passing through Python; only the last stage's output is analyzed.
+        The whole chain counts as one slot against HACKAI_MAX_CONCURRENT.
+        """
+        for tool_name, _ in stages:
+            if tool_name not in self.tools:
+                raise ValueError(f"Tool {tool_name} not found")
+        
+        # Only the first stage is pointed at the target; later stages take it from stdin
+        cmds = []
+        for i, (tool_name, args) in enumerate(stages):
+            tool = self.tools[tool_name]
+            cmd = [tool.command, *tool.common_args, *args]
+            if i == 0 and target and tool.requires_target:
+                cmd.append(target)
+            cmds.append(cmd)
+        # "+" rather than "|" since the name becomes the archive file name, and "|" is invalid on Windows
+        chain_name = "+".join(tool_name for tool_name, _ in stages)
+        command = " | ".join(shlex.join(cmd) for cmd in cmds)
+        start_time = time.time()
+        procs = []
         
-        return count
+        try:
+            async with self._semaphore():
+                stdin = None
+                for i, cmd in enumerate(cmds):
+                    last = i == len(cmds) - 1
+                    read_fd, write_fd = (None, None) if last else os.pipe()
+                    try:
+                        procs.append(await asyncio.create_subprocess_exec(
+                            *cmd, stdin=stdin,
+                            stdout=asyncio.subprocess.PIPE if last else write_fd,
+                            stderr=asyncio.subprocess.DEVNULL))
+                    except BaseException:
+                        # Nobody will read from this stage's pipe
+                        if read_fd is not None:
+                            os.close(read_fd)
+                        raise
+                    finally:
+                        # The children hold their own copies of the pipe ends
+                        if stdin is not None:
+                            os.close(stdin)
+                        if write_fd is not None:
+                            os.close(write_fd)
+                    stdin = read_fd
+                
+                try:
+                    output, vulnerabilities, rank, output_path = await asyncio.wait_for(
+                        self._collect(procs, chain_name, session_id), timeout=300)
+                except asyncio.TimeoutError:
+                    for proc in procs:
+                        if proc.returncode is None:
+                            proc.kill()
+                    await asyncio.gather(*(proc.wait() for proc in procs))
+                    raise
+            duration = time.time() - start_time
+            
+            # Like bash's pipefail: the chain fails if any stage failed
+            exit_code = next((proc.returncode for proc in procs if proc.returncode != 0), 0)
+            
+            return ScanResult(
+                tool=chain_name,
+                target=target,
+                command=command,
+                output=output,
+                exit_code=exit_code,
+                duration=duration,
+                timestamp=time.time(),
+                success=exit_code == 0,
+                session_id=session_id,
+                risk_level=_RISK_BY_RANK[rank],
+                vulnerabilities_found=vulnerabilities,
+                output_path=output_path
+            )
+            
+        except asyncio.TimeoutError:
+            output = "Tool execution timed out"
+        except Exception as e:
+            # A stage that failed to start leaves the earlier ones writing into a closed pipe
+            for proc in procs:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+            output = f"Error: {str(e)}"
+        
+        return ScanResult(
+            tool=chain_name,
+            target=target,
+            command=command,
+            output=output,
+            exit_code=-1,
+            duration=time.time() - start_time,
+            timestamp=time.time(),
+            success=False,
+            session_id=session_id,
+            risk_level="high",
+            vulnerabilities_found=0
+        )
     
-    def _assess_risk_level(self, output: str, tool_name: str) -> str:
-        """Assess risk level based on tool output"""
-        output_lower = output.lower()
-        
-        if any(word in output_lower for word in ["critical", "vulnerable", "exploit"]):
-            return "critical"
-        elif any(word in output_lower for word in ["high", "dangerous", "severe"]):
-            return "high"
-        elif any(word in output_lower for word in ["medium", "warning", "caution"]):
-            return "medium"
-        else:
-            return "low"
+    def _analyze_output(self, output: str) -> Tuple[int, int]:
+        """Count vulnerability keywords and find the highest risk rank in one pass over the output"""
+        count = 0
+        rank = 0
+        for match in _VULN_RE.finditer(output.lower()):
+            counted, keyword_rank = _VULN_KEYWORDS[match.group()]
+            count += counted
+            rank = max(rank, keyword_rank)
+        return count, rank
+    
+    async def _collect(self, procs, name: str, session_id: str) -> Tuple[str, int, int, str]:
+        """Stream the last process's stdout, then wait for every process to exit
+        
+        Callers put this whole coroutine under one timeout, so a tool that closes
+        stdout but keeps running is still killed.
+        """
+        streamed = await self._stream_output(procs[-1], name, session_id)
+        await asyncio.gather(*(proc.wait() for proc in procs))
+        return streamed
+    
+    async def _stream_output(self, proc, tool_name: str, session_id: str) -> Tuple[str, int, int, str]:
+        """Read stdout chunk by chunk, scanning as it arrives and keeping only the tail in memory"""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        tail = pending = ""
+        total = count = rank = 0
+        archive = None
+        output_path = ""
+        
+        try:
+            while True:
+                chunk = await proc.stdout.read(_READ_CHUNK)
+                text = decoder.decode(chunk, final=not chunk)
+                total += len(text)
+                
+                # Scan complete lines only, so a keyword is never split across two chunks
+                pending += text
+                cut = pending.rfind("\n") + 1
+                if not chunk or cut == 0 and len(pending) > OUTPUT_TAIL_CHARS:
+                    cut = len(pending)
+                hits, hit_rank = self._analyze_output(pending[:cut])
+                count += hits
+                rank = max(rank, hit_rank)
+                pending = pending[cut:]
+                
+                # Once the output outgrows the tail, everything seen so far is tail + text
+                if archive is None and total > OUTPUT_TAIL_CHARS:
+                    path = OUTPUT_DIR / session_id / f"{tool_name}.gz"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    archive = gzip.open(path, "wt", encoding="utf-8")
+                    archive.write(tail)
+                    output_path = str(path)
+                if archive is not None:
+                    archive.write(text)
+                tail = (tail + text)[-OUTPUT_TAIL_CHARS:]
+                
+                if not chunk:
+                    break
+        finally:
+            if archive is not None:
+                archive.close()
+        
+        # The archive path stays out of the text (it is on ScanResult.output_path): it embeds
+        # the session id, and the output text is part of the AI cache key
+        if output_path:
+            tail = f"...[truncated {total - len(tail)} characters]\n" + tail
+        return tail, count, rank, output_path
     
     def list_tools(self, category: str = None, show_status: bool = True):
         """List available tools"""
         availability = self.check_tool_availability() if show_status else {}
         
+        by_category = self._categories()
         if category:
-            tools = {name: tool for name, tool in self.tools.items() if tool.category == category}
+            selected = {category: by_category[category]} if category in by_category else {}
         else:
-            tools = self.tools
-        
-        # Group by category
-        categories = {}
-        for name, tool in tools.items():
-            cat = tool.category
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append({
-                'name': name,
-                'description': tool.description,
-                'available': availability.get(name, False) if show_status else None
-            })
-        
-        # Display tools
-        for cat, tool_list in sorted(categories.items()):
-            print(f"\n{Colors.colorize(f'📂 {cat.upper()} ({len(tool_list)} tools)', Colors.YELLOW)}")
-            for tool in tool_list:
+            selected = by_category
+        
+        # Collect each tool line and tally its category in the same pass; written out in one go
+        lines = []
+        ok = Colors.colorize("✅", Colors.GREEN)
+        bad = Colors.colorize("❌", Colors.RED)
+        category_stats = {}
+        for cat, names in selected.items():
+            lines.append(f"\n{Colors.colorize(f'📂 {cat.upper()} ({len(names)} tools)', Colors.YELLOW)}")
+            available_in_cat = 0
+            for name in names:
+                description = self.tools[name].description
                 if show_status:
-                    status = Colors.colorize("✅", Colors.GREEN) if tool['available'] else Colors.colorize("❌", Colors.RED)
-                    print(f"  {status} {tool['name']}: {tool['description']}")
+                    available = availability.get(name, False)
+                    available_in_cat += available
+                    lines.append(f"  {ok if available else bad} {name}: {description}")
                 else:
-                    print(f"  • {tool['name']}: {tool['description']}")
+                    lines.append(f"  • {name}: {description}")
+            category_stats[cat] = (available_in_cat, len(names))
         
         # Show categories summary
         if show_status:
-            print(f"\n{Colors.colorize('📋 Categories Summary:', Colors.CYAN)}")
-            category_stats = {}
-            for cat, tool_list in categories.items():
-                available_in_cat = sum(1 for t in tool_list if t['available'])
-                category_stats[cat] = {'total': len(tool_list), 'available': available_in_cat}
-            
-            for cat, stats in sorted(category_stats.items()):
-                available = stats['available']
-                total = stats['total']
-                print(f"  {cat}: {Colors.colorize(f'{available}/{total}', Colors.GREEN if available == total else Colors.YELLOW)}")
+            lines.append(f"\n{Colors.colorize('📋 Categories Summary:', Colors.CYAN)}")
+            for cat, (available, total) in category_stats.items():
+                lines.append(f"  {cat}: {Colors.colorize(f'{available}/{total}', Colors.GREEN if available == total else Colors.YELLOW)}")
+        
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
     
     def install_tool(self, tool_name: str) -> bool:
         """Install a tool using its install command"""
@@ -341,10 +623,11 @@ class ToolManager:
         
         try:
             print(f"{Colors.colorize(f'📦 Installing {tool_name}...', Colors.BLUE)}")
-            result = subprocess.run(tool.install_cmd.split(), 
+            result = subprocess.run(tool.install_cmd, 
                                   capture_output=True, text=True, timeout=300)
             
             if result.returncode == 0:
+                self._availability_cache = None
                 print(f"{Colors.colorize(f'✅ {tool_name} installed successfully', Colors.GREEN)}")
                 return True
             else:
@@ -353,3 +636,55 @@ class ToolManager:
         except Exception as e:
             print(f"{Colors.colorize(f'❌ Error installing {tool_name}: {str(e)}', Colors.RED)}")
             return False
+    
+    def install_many(self, tool_names: List[str]) -> Dict[str, bool]:
+        """Install several tools, batching those that share a package manager into one invocation"""
+        batches: Dict[Tuple[str, ...], List[str]] = {}
+        singles = []
+        for name in dict.fromkeys(tool_names):
+            tool = self.tools.get(name)
+            cmd = tool.install_cmd if tool else None
+            if cmd and tuple(cmd[:2]) in _BATCH_INSTALLERS:
+                # Key on the installer and its flags, e.g. ("apt", "install", "-y")
+                flags = tuple(token for token in cmd[2:] if token.startswith("-"))
+                batches.setdefault(tuple(cmd[:2]) + flags, []).append(name)
+            else:
+                singles.append(name)
+        
+        # Each package manager gets one job, so two apt runs never fight over the dpkg lock
+        jobs = [functools.partial(self._install_batch, key, names) for key, names in batches.items()]
+        jobs += [functools.partial(self._install_single, name) for name in singles]
+        
+        results = {}
+        for future in [self._executor().submit(job) for job in jobs]:
+            results.update(future.result())
+        return {name: results[name] for name in dict.fromkeys(tool_names)}
+    
+    def _install_single(self, tool_name: str) -> Dict[str, bool]:
+        """Install one tool on its own"""
+        return {tool_name: self.install_tool(tool_name)}
+    
+    def _install_batch(self, key: Tuple[str, ...], tool_names: List[str]) -> Dict[str, bool]:
+        """Install tools sharing a package manager in one call, falling back to one at a time on failure"""
+        if len(tool_names) == 1:
+            return self._install_single(tool_names[0])
+        
+        packages = [token for name in tool_names
+                    for token in self.tools[name].install_cmd[2:] if not token.startswith("-")]
+        cmd = list(key[:2]) + packages + list(key[2:])
+        names = ", ".join(tool_names)
+        
+        try:
+            print(f"{Colors.colorize(f'📦 Installing {names}...', Colors.BLUE)}")
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300 * len(tool_names))
+            
+            if result.returncode == 0:
+                self._availability_cache = None
+                print(f"{Colors.colorize(f'✅ {names} installed successfully', Colors.GREEN)}")
+                return {name: True for name in tool_names}
+        except Exception:
+            pass
+        
+        # One bad package fails the whole batch, so retry each tool to find out which
+        print(f"{Colors.colorize(f'⚠️  Batch install failed, installing {names} one at a time', Colors.YELLOW)}")
+        return {name: self.install_tool(name) for name in tool_names}